@@ -1,28 +1,34 @@
-from typing import List
+from typing import List, Optional
+
+import networkx as nx
 
 from pycid.analyze.requisite_graph import requisite_graph
 from pycid.core.cid import CID
 from pycid.core.get_paths import find_all_dir_paths
 
 
-def admits_ri(cid: CID, decision: str, node: str) -> bool:
-    r"""Check if a CID admits a response incentive on a node.
-
-     - A CID G admits a response incentive on X ∈ V \ {D} if
-    and only if the reduced graph G* min has a directed path X --> D.
-    ("Agent Incentives: a Causal Perspective" by Everitt, Carey, Langlois, Ortega, and Legg, 2020)
-    """
+def _check_ri_preconditions(cid: CID, decision: str, node: Optional[str] = None) -> None:
+    """Raise an error if response incentives can't be evaluated for this CID, decision and (optional) node."""
     if len(cid.agents) > 1:
         raise ValueError(
             f"This CID has {len(cid.agents)} agents. This incentive is currently only valid for CIDs with one agent."
         )
-
-    if node not in cid.nodes:
+    if node is not None and node not in cid.nodes:
         raise KeyError(f"{node} is not present in the cid")
     if decision not in cid.nodes:
         raise KeyError(f"{decision} is not present in the cid")
     if not cid.sufficient_recall():
         raise ValueError("Response inventives are only implemented for graphs with sufficient recall")
+
+
+def admits_ri(cid: CID, decision: str, node: str) -> bool:
+    r"""Check if a CID admits a response incentive on a node.
+
+     - A CID G admits a response incentive on X ∈ V \ {D} if
+    and only if the reduced graph G* min has a directed path X --> D.
+    ("Agent Incentives: a Causal Perspective" by Everitt, Carey, Langlois, Ortega, and Legg, 2020)
+    """
+    _check_ri_preconditions(cid, decision, node)
     if node == decision:
         return False
 
@@ -39,4 +45,7 @@ def admits_ri_list(cid: CID, decision: str) -> List[str]:
     """
     Return the list of nodes in cid that admit a response incentive.
     """
-    return [x for x in list(cid.nodes) if admits_ri(cid, decision, x)]
+    _check_ri_preconditions(cid, decision)
+    # a single reverse traversal from the decision finds every node with a directed path to it
+    ancestors = nx.ancestors(requisite_graph(cid), decision)
+    return [x for x in cid.nodes if x in ancestors]
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
-import copy
 import itertools
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Iterator, KeysView, List, Optional, Set, Tuple, Union
 
 import networkx as nx
-from pgmpy.factors.discrete import TabularCPD
 
 from pycid.core.cpd import DecisionDomain, StochasticFunctionCPD
 from pycid.core.macid_base import AgentLabel, MACIDBase
-from pycid.core.relevance_graph import CondensedRelevanceGraph
-from pycid.export.gambit import behavior_to_cpd, macid_to_efg, pygambit_ne_solver
+from pycid.core.relevance_graph import CondensedRelevanceGraph, RelevanceGraph
+from pycid.export.gambit import EFGTree, behavior_to_cpd, macid_to_efg_tree, pygambit_ne_solver
 
 Outcome = Any
 
@@ -18,6 +17,21 @@ Outcome = Any
 class MACID(MACIDBase):
     """A Multi-Agent Causal Influence Diagram"""
 
+    _structure_caches = MACIDBase._structure_caches + ("_relevance_graph", "_condensed_relevance_graph")
+
+    # EFG trees of subgames, reused while solving subgames that differ only in their CPDs (set by get_spe)
+    _efg_trees: Optional[Dict[Hashable, EFGTree]] = None
+
+    @cached_property
+    def _relevance_graph(self) -> RelevanceGraph:
+        """The relevance graph of all decisions in the MACID, recomputed only after structural changes"""
+        return RelevanceGraph(self)
+
+    @cached_property
+    def _condensed_relevance_graph(self) -> CondensedRelevanceGraph:
+        """The condensed relevance graph of the MACID, recomputed only after structural changes"""
+        return CondensedRelevanceGraph(self, self._relevance_graph)
+
     def get_ne(self, solver: Optional[str] = None) -> List[List[StochasticFunctionCPD]]:
         """
         Return a list of Nash equilbiria in the MACID using pygambit solvers.
@@ -92,26 +106,29 @@ class MACID(MACIDBase):
 
         # random initialise decisions not already instantiated that aren't active in this subgame.
         # (this is to ensure that they are all "fully mixed - i.e., every action is chosen with positive probability")
-        macid_copy = self.copy()
-        for d in macid_copy.decisions:
-            if not macid_copy.is_s_reachable(active_subgame_decs, d) and isinstance(
-                macid_copy.get_cpds(d), DecisionDomain
-            ):
-                macid_copy.impute_random_decision(d)
-
-        # for every node in the subgame that is a parent of a r_nodes_plus_decs node,
-        #  marginalise out its parents from its CPD
-        parents_for_marginalisation_of_original_cpd = set(sg_macid.nodes) - r_nodes_plus_decs
-        for node in parents_for_marginalisation_of_original_cpd:
-            cpd = macid_copy.get_cpds(node)
-            cpd.marginalize(macid_copy.get_parents(node))
-            marginalised_probs = cpd.get_values()
-            unpack_probs = [item for sublist in marginalised_probs for item in sublist]
-            sg_macid.model[node] = dict(zip(cpd.domain, unpack_probs))
-
-        # copy over the cpds for everything else
-        for node in set(sg_macid.nodes) - parents_for_marginalisation_of_original_cpd:
-            sg_macid.model[node] = macid_copy.get_cpds(node)  # or self.model[node]
+        # The random decision rules are only imputed for the duration of the subgame's construction.
+        random_decisions = [
+            d
+            for d in self.decisions
+            if not self.is_s_reachable(active_subgame_decs, d) and isinstance(self.get_cpds(d), DecisionDomain)
+        ]
+        with self._cpd_overlay(random_decisions):
+            for d in random_decisions:
+                self.impute_random_decision(d)
+
+            # for every node in the subgame that is a parent of a r_nodes_plus_decs node,
+            #  marginalise out its parents from its CPD
+            parents_for_marginalisation_of_original_cpd = set(sg_macid.nodes) - r_nodes_plus_decs
+            for node in parents_for_marginalisation_of_original_cpd:
+                cpd = self.get_cpds(node).copy()
+                cpd.marginalize(self.get_parents(node))
+                marginalised_probs = cpd.get_values()
+                unpack_probs = [item for sublist in marginalised_probs for item in sublist]
+                sg_macid.model[node] = dict(zip(cpd.domain, unpack_probs))
+
+            # copy over the cpds for everything else
+            for node in set(sg_macid.nodes) - parents_for_marginalisation_of_original_cpd:
+                sg_macid.model[node] = self.get_cpds(node).copy()
 
         return sg_macid
 
@@ -131,26 +148,77 @@ class MACID(MACIDBase):
         - If decisions_in_sg is not specified, this method finds NE in the full MACID.
         - If the MACID being operated on already has function CPDs for some decision nodes, it is
         assumed that these have already been optimised and so these are not changed.
+        - If the subgame splits into independent parts, pure NE are found in each part separately and then
+        combined. Two parts are independent if no decision in one is relevant to a decision in the other, and
+        no decision or parent of a decision in one is an ancestor of (or equal to) one in the other.
         """
         if decisions_in_sg is None:
             decisions_in_sg = self.decisions
         else:
             decisions_in_sg = set(decisions_in_sg)  # For efficient membership checks
+        agents_in_sg = {self.decision_agent[dec] for dec in decisions_in_sg}
+
+        # A part's decision rules are optimal whatever the rules in the other parts, and the other parts'
+        # pure decisions can't leave any of its information sets unreached, since they aren't ancestors of its
+        # EFG nodes. So the pure NE of the subgame are exactly the combinations of pure NE in its independent
+        # parts, and each part's EFG is much smaller than the EFG of the whole subgame.
+        if solver == "enumpure" or (solver is None and len(agents_in_sg) != 2):
+            dependence = nx.Graph()
+            dependence.add_nodes_from(decisions_in_sg)
+            dependence.add_edges_from(
+                (d1, d2) for d1, d2 in self._relevance_graph.edges(decisions_in_sg) if d2 in decisions_in_sg
+            )
+            family = {d: {d, *self.get_parents(d)} for d in decisions_in_sg}
+            ancestors = {d: set().union(family[d], *(nx.ancestors(self, node) for node in family[d])) for d in family}
+            dependence.add_edges_from(
+                (d1, d2)
+                for d1, d2 in itertools.combinations(decisions_in_sg, 2)
+                if family[d1] & ancestors[d2] or family[d2] & ancestors[d1]
+            )
+            parts = list(nx.connected_components(dependence))
+            if len(parts) > 1:
+                ne_in_parts = [self._get_ne_in_sg_from_efg(part, "enumpure") for part in parts]
+                ne_in_sg = [list(itertools.chain.from_iterable(ne)) for ne in itertools.product(*ne_in_parts)]
+                # if there is no pure NE, the default solver falls back to a mixed NE of the whole subgame
+                if ne_in_sg or solver is not None:
+                    return ne_in_sg
+
+        return self._get_ne_in_sg_from_efg(decisions_in_sg, solver)
+
+    def _get_ne_in_sg_from_efg(
+        self, decisions_in_sg: Union[KeysView[str], Set[str]], solver: Optional[str] = None
+    ) -> List[List[StochasticFunctionCPD]]:
+        """Return a list of NE in a MACID subgame by solving its EFG with pygambit."""
         agents_in_sg = list({self.decision_agent[dec] for dec in decisions_in_sg})
 
         # We exploit the fact that we only need to create an EFG correspondsing to the MACID subgame
         # we don't need to create an EFG for the full MACID
         # - the macid_to_efg transformation is exponential in the number of MACID nodes
         sg_macid = self.create_subgame(decisions_in_sg)
+        efg_tree = self._get_efg_tree(sg_macid, decisions_in_sg, agents_in_sg)
         # pygambit NE solver
-        efg, parents_to_infoset = macid_to_efg(sg_macid, decisions_in_sg, agents_in_sg)
-        ne_behavior_strategies = pygambit_ne_solver(efg, solver_override=solver)
+        ne_behavior_strategies = pygambit_ne_solver(efg_tree.game, solver_override=solver)
         ne_in_sg = [
-            behavior_to_cpd(sg_macid, parents_to_infoset, strat, decisions_in_sg) for strat in ne_behavior_strategies
+            behavior_to_cpd(sg_macid, efg_tree.parents_to_infoset, strat, decisions_in_sg)
+            for strat in ne_behavior_strategies
         ]
 
         return ne_in_sg
 
+    def _get_efg_tree(
+        self, sg_macid: MACID, decisions_in_sg: Union[KeysView[str], Set[str]], agents_in_sg: List[AgentLabel]
+    ) -> EFGTree:
+        """Return the EFG tree of a subgame, refilling a tree built for a subgame with the same structure if any."""
+        if self._efg_trees is None:
+            return macid_to_efg_tree(sg_macid, decisions_in_sg, agents_in_sg)
+        key = (
+            frozenset(decisions_in_sg),
+            frozenset(sg_macid.edges),
+            frozenset((node, tuple(sg_macid.model.domain[node])) for node in sg_macid.nodes),
+        )
+        self._efg_trees[key] = macid_to_efg_tree(sg_macid, decisions_in_sg, agents_in_sg, self._efg_trees.get(key))
+        return self._efg_trees[key]
+
     def get_spe(self, solver: Optional[str] = None) -> List[List[StochasticFunctionCPD]]:
         """Return a list of subgame perfect equilbiria (SPE) in the MACIM.
         By default, this finds mixed eq using the 'enummixed' pygambit solver for 2-player subgames, and
@@ -158,41 +226,68 @@ class MACID(MACIDBase):
         it uses the 'simpdiv' solver to find a mixed eq.
         Use the 'solver' argument to change this behavior (see get_ne method for details).
         - Each SPE comes as a list of FunctionCPDs, one for each decision node in the MACID.
+        - If every decision in an SCC of the condensed relevance graph already has a decision rule imputed,
+        those rules are kept unchanged in every SPE, and the SCC's subgame is not solved. If only some decisions
+        in an SCC have rules, the whole SCC is solved as usual, so all of its rules may change.
         """
-        spes: List[List[StochasticFunctionCPD]] = [[]]
+        return list(self.get_spe_iter(solver))
 
+    def get_spe_iter(self, solver: Optional[str] = None) -> Iterator[List[StochasticFunctionCPD]]:
+        """Iterate over the subgame perfect equilbiria (SPE) in the MACIM, in the same order as get_spe.
+        The SPEs are found lazily, so eg next(macid.get_spe_iter()) only solves the subgames needed for the first SPE.
+        See get_spe for the solvers used.
+        """
         macid = self.copy()
-        # backwards induction over the sccs in the condensed relevance graph (handling tie-breaks)
-        for scc in reversed(CondensedRelevanceGraph(macid).get_scc_topological_ordering()):
-            extended_spes = []
-            for partial_profile in spes:
-                macid.add_cpds(*partial_profile)
-                ne_in_sg = macid.get_ne_in_sg(decisions_in_sg=scc, solver=solver)
-                for ne in ne_in_sg:
-                    extended_spes.append(partial_profile + list(ne))
-            spes = extended_spes
-        return spes
+        # the subgame of an scc has the same EFG tree for every partial profile, only its payoffs differ
+        macid._efg_trees = {}
+        levels = self._condensed_relevance_graph.get_scc_levels()
+        for spe in macid._extend_spes(levels, (), solver):
+            yield list(spe)
+
+    def _extend_spes(
+        self,
+        levels: List[List[List[str]]],
+        partial_profile: Tuple[StochasticFunctionCPD, ...],
+        solver: Optional[str] = None,
+    ) -> Iterator[Tuple[StochasticFunctionCPD, ...]]:
+        """Yield the SPEs extending a partial profile whose decision rules are imputed in this MACID.
+
+        This is backwards induction over the levels of sccs in the condensed relevance graph (handling tie-breaks),
+        depth first so that only one branch of partial profiles is held at a time. The sccs in a level don't rely
+        on each other, so the NE in each of them are found once per partial profile and then combined.
+        """
+        if not levels:
+            yield partial_profile
+            return
+        level, *remaining_levels = levels
+        ne_in_sccs = [self._get_ne_in_scc(scc, solver) for scc in level]
+        # the decision rules imputed for one NE mustn't be seen when solving the subgames of the next one
+        with self._cpd_overlay([d for scc in level for d in scc]):
+            for ne in itertools.product(*ne_in_sccs):
+                ne_profile = tuple(itertools.chain.from_iterable(ne))
+                self.add_cpds(*ne_profile)
+                yield from self._extend_spes(remaining_levels, partial_profile + ne_profile, solver)
+
+    def _get_ne_in_scc(self, scc: List[str], solver: Optional[str] = None) -> List[List[StochasticFunctionCPD]]:
+        """Return the NE in the subgame of an SCC, unless all its decisions already have a decision rule.
+
+        If they all do, those rules are kept as the only NE without calling a solver. This applies only to whole
+        SCCs: if any decision in the SCC has no rule yet, all of the SCC's decisions are solved for."""
+        if not any(isinstance(self.get_cpds(d), DecisionDomain) for d in scc):
+            return [[self.get_cpds(d) for d in scc]]
+        return self.get_ne_in_sg(decisions_in_sg=scc, solver=solver)
 
     def decs_in_each_maid_subgame(self) -> List[set]:
         """
         Return a list giving the set of decision nodes in each MAID subgame of the original MAID.
         """
-        con_rel = CondensedRelevanceGraph(self)
-        con_rel_sccs = con_rel.nodes  # the nodes of the condensed relevance graph are the maximal sccs of the MA(C)ID
-        powerset = list(
-            itertools.chain.from_iterable(
-                itertools.combinations(con_rel_sccs, r) for r in range(1, len(con_rel_sccs) + 1)
-            )
-        )
-        con_rel_subgames = copy.deepcopy(powerset)
-        for subset in powerset:
-            for node in subset:
-                if not nx.descendants(con_rel, node).issubset(subset) and subset in con_rel_subgames:
-                    con_rel_subgames.remove(subset)
-
-        dec_subgames = [
-            [con_rel.get_decisions_in_scc()[scc] for scc in con_rel_subgame] for con_rel_subgame in con_rel_subgames
-        ]
+        con_rel = self._condensed_relevance_graph
+        # a MAID subgame corresponds to a non-empty set of sccs that is closed under descendants
+        # in the condensed relevance graph, so we generate exactly those sets rather than filtering a powerset
+        con_rel_subgames = sorted(_descendant_closed_subsets(con_rel), key=len)
+
+        decisions_in_scc = con_rel.get_decisions_in_scc()
+        dec_subgames = [[decisions_in_scc[scc] for scc in con_rel_subgame] for con_rel_subgame in con_rel_subgames]
 
         return [set(itertools.chain.from_iterable(i)) for i in dec_subgames]
 
@@ -205,18 +300,39 @@ class MACID(MACIDBase):
     def policy_profile_assignment(self, partial_policy: Iterable[StochasticFunctionCPD]) -> Dict:
         """Return a dictionary with the joint or partial policy profile assigned -
         ie a decision rule for each of the MACIM's decision nodes."""
-        pp: Dict[str, Optional[TabularCPD]] = {d: None for d in self.decisions}
-        pp.update({cpd.variable: cpd for cpd in partial_policy})
-        return pp
+        # decisions without a decision rule in the partial policy are assigned None
+        return {**dict.fromkeys(self.decisions), **{cpd.variable: cpd for cpd in partial_policy}}
 
     def copy_without_cpds(self) -> MACID:
         """copy the MACID structure"""
-        new = MACID()
+        new = MACID(
+            agent_decisions={agent: list(nodes) for agent, nodes in self.agent_decisions.items()},
+            agent_utilities={agent: list(nodes) for agent, nodes in self.agent_utilities.items()},
+        )
         new.add_nodes_from(self.nodes)
         new.add_edges_from(self.edges)
-        for agent in self.agents:
-            for decision in self.agent_decisions[agent]:
-                new.make_decision(decision, agent)
-            for utility in self.agent_utilities[agent]:
-                new.make_utility(utility, agent)
         return new
+
+
+def _descendant_closed_subsets(dag: nx.DiGraph) -> Iterator[FrozenSet[Any]]:
+    """Iterate over the non-empty sets of nodes in a DAG that contain all of their members' descendants.
+
+    Nodes are considered in reverse topological order, so a node's descendants have all been decided upon
+    by the time we choose whether to include it: it can be included only if they all were. The choices are
+    explored depth first with an explicit stack, so long chains of nodes don't hit the recursion limit."""
+    descendants = {node: frozenset(nx.descendants(dag, node)) for node in dag.nodes}
+    order = list(reversed(list(nx.topological_sort(dag))))
+
+    # each entry is the index of the next node to decide upon and the nodes chosen so far
+    stack: List[Tuple[int, FrozenSet[Any]]] = [(0, frozenset())]
+    while stack:
+        idx, chosen = stack.pop()
+        if idx == len(order):
+            if chosen:
+                yield chosen
+            continue
+        node = order[idx]
+        # pushed first, so the subsets excluding the node are generated first
+        if descendants[node] <= chosen:
+            stack.append((idx + 1, chosen | {node}))
+        stack.append((idx + 1, chosen))
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import itertools
 import math
-from functools import lru_cache
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
 from typing import (
     Any,
     Callable,
     Collection,
     Dict,
+    FrozenSet,
     Hashable,
     Iterable,
     Iterator,
@@ -53,6 +55,9 @@ class MACIDBase(CausalBayesianNetwork):
         A dictionary mapping utility node label => agent label.
     """
 
+    # cached attributes that must be recomputed whenever the structure of the (MA)CID changes
+    _structure_caches: Tuple[str, ...] = ("_mechanism_graph", "_r_reachable_nodes")
+
     class Model(CausalBayesianNetwork.Model):
         def __setitem__(self, variable: str, relationship: Union[Relationship, Sequence]) -> None:
             if isinstance(relationship, (DecisionDomain, Sequence)) and variable not in self.cbn.decisions:
@@ -117,6 +122,7 @@ class MACIDBase(CausalBayesianNetwork):
         else:
             self.agent_decisions[agent].append(node)
         self.decision_agent[node] = agent
+        self._clear_structure_caches()
 
     def make_utility(self, node: str, agent: AgentLabel = 0) -> None:
         """ "Turn a chance or utility node into a decision node."""
@@ -126,6 +132,7 @@ class MACIDBase(CausalBayesianNetwork):
         else:
             self.agent_utilities[agent].append(node)
         self.utility_agent[node] = agent
+        self._clear_structure_caches()
 
     def make_chance(self, node: str) -> None:
         """Turn a decision node into a chance node."""
@@ -137,6 +144,46 @@ class MACIDBase(CausalBayesianNetwork):
         elif node in set(self.utilities):
             agent = self.utility_agent.pop(node)
             self.agent_utilities[agent].remove(node)
+        self._clear_structure_caches()
+
+    @cached_property
+    def _mechanism_graph(self) -> MechanismGraph:
+        """The mechanism graph of the (MA)CID, recomputed only after structural changes.
+
+        It is shared by all d-connection queries on the mechanisms, so it must not be modified."""
+        return MechanismGraph(self)
+
+    @cached_property
+    def _r_reachable_nodes(self) -> Dict[str, FrozenSet[str]]:
+        """The nodes r-reachable from each decision queried so far, dropped after structural changes"""
+        return {}
+
+    def _clear_structure_caches(self) -> None:
+        """Drop the cached values that depend on the graph structure or on the agents' node assignments.
+
+        The names of the cached attributes are listed in _structure_caches."""
+        for name in self._structure_caches:
+            self.__dict__.pop(name, None)
+
+    def add_node(self, node: str, *args: Any, **kwargs: Any) -> None:
+        super().add_node(node, *args, **kwargs)
+        self._clear_structure_caches()
+
+    def add_edge(self, u: str, v: str, **kwargs: Any) -> None:
+        super().add_edge(u, v, **kwargs)
+        self._clear_structure_caches()
+
+    def remove_node(self, node: str) -> None:
+        super().remove_node(node)
+        self._clear_structure_caches()
+
+    def remove_edge(self, u: str, v: str) -> None:
+        super().remove_edge(u, v)
+        self._clear_structure_caches()
+
+    def remove_edges_from(self, ebunch: Iterable[Tuple[str, str]]) -> None:
+        super().remove_edges_from(ebunch)
+        self._clear_structure_caches()
 
     def add_cpds(self, *cpds: TabularCPD, **relationships: Union[Relationship, List[Outcome]]) -> None:
         super().add_cpds(*cpds, **relationships)
@@ -164,10 +211,13 @@ class MACIDBase(CausalBayesianNetwork):
         intervention = intervention or {}
 
         # Check that strategically relevant decisions have a policy specified
-        mech_graph = MechanismGraph(self)
-        for intervention_var in intervention:
-            for parent in self.get_parents(intervention_var):
-                mech_graph.remove_edge(parent, intervention_var)
+        if intervention:
+            mech_graph = MechanismGraph(self)
+            for intervention_var in intervention:
+                for parent in self.get_parents(intervention_var):
+                    mech_graph.remove_edge(parent, intervention_var)
+        else:
+            mech_graph = self._mechanism_graph
         for decision in self.decisions:
             for query_node in query:
                 if mech_graph.is_dconnected(
@@ -242,17 +292,29 @@ class MACIDBase(CausalBayesianNetwork):
         """
         if isinstance(decisions, str):
             decisions = [decisions]
-        if isinstance(nodes, str):
-            nodes = [nodes]
-        mg = MechanismGraph(self)
-        for decision in decisions:
-            for node in nodes:
-                con_nodes = [decision] + self.get_parents(decision)
-                agent_utilities = self.agent_utilities[self.decision_agent[decision]]
-                for utility in set(agent_utilities).intersection(nx.descendants(self, decision)):
-                    if mg.is_dconnected(node + "mec", utility, con_nodes):
-                        return True
-        return False
+        nodes = [nodes] if isinstance(nodes, str) else list(nodes)
+        for node in nodes:
+            if node not in self.nodes:
+                raise KeyError(f"{node} is not in the (MA)CID")
+        return any(node in self._get_r_reachable_nodes(decision) for decision in decisions for node in nodes)
+
+    def _get_r_reachable_nodes(self, decision: str) -> FrozenSet[str]:
+        """Return the nodes r-reachable from a decision, memoised until the structure of the (MA)CID changes.
+
+        By the symmetry of d-separation, a node's mechanism is d-connected to a utility node iff it is an active
+        trail node from that utility, so one search per utility node covers all nodes."""
+        if decision not in self._r_reachable_nodes:
+            con_nodes = [decision] + self.get_parents(decision)
+            agent_utilities = self.agent_utilities[self.decision_agent[decision]]
+            descendant_utilities = set(agent_utilities).intersection(nx.descendants(self, decision))
+            active_trail_nodes: Set[str] = set()
+            if descendant_utilities:
+                trails = self._mechanism_graph.active_trail_nodes(list(descendant_utilities), observed=con_nodes)
+                active_trail_nodes = set().union(*trails.values())
+            self._r_reachable_nodes[decision] = frozenset(
+                node for node in self.nodes if node + "mec" in active_trail_nodes
+            )
+        return self._r_reachable_nodes[decision]
 
     def sufficient_recall(self, agent: Optional[AgentLabel] = None) -> bool:
         """
@@ -368,6 +430,18 @@ class MACIDBase(CausalBayesianNetwork):
                 d, lambda **pv: {outcome: 1 / len(domain) for outcome in domain}, self, domain, label="random_decision"
             )
 
+    @contextmanager
+    def _cpd_overlay(self, variables: Iterable[str]) -> Iterator[None]:
+        """Restore the CPDs of the given variables when the context exits.
+
+        This lets the CPDs of a few variables be changed temporarily without copying the whole (MA)CID."""
+        saved = {variable: self.model[variable] for variable in variables}
+        try:
+            yield
+        finally:
+            for variable, relationship in saved.items():
+                self.model[variable] = relationship
+
     def impute_fully_mixed_policy_profile(self) -> None:
         """Impute a fully mixed policy profile - ie a random decision rule to all decision nodes"""
         for d in self.decisions:
@@ -421,14 +495,12 @@ class MACIDBase(CausalBayesianNetwork):
 
     def copy_without_cpds(self) -> MACIDBase:
         """copy the MACIDBase object without its CPDs"""
-        new = MACIDBase()
+        new = MACIDBase(
+            agent_decisions={agent: list(nodes) for agent, nodes in self.agent_decisions.items()},
+            agent_utilities={agent: list(nodes) for agent, nodes in self.agent_utilities.items()},
+        )
         new.add_nodes_from(self.nodes)
         new.add_edges_from(self.edges)
-        for agent in self.agents:
-            for decision in self.agent_decisions[agent]:
-                new.make_decision(decision, agent)
-            for utility in self.agent_utilities[agent]:
-                new.make_utility(utility, agent)
         return new
 
     def _get_color(self, node: str) -> Union[np.ndarray, str]:
@@ -84,9 +84,9 @@ class CondensedRelevanceGraph(nx.DiGraph):
     The condensed_relevance graph will always be acyclic. Therefore, we can return a topological ordering.
     """
 
-    def __init__(self, macid: MACIDBase):
+    def __init__(self, macid: MACIDBase, relevance_graph: Optional[RelevanceGraph] = None):
         super().__init__()
-        rg = RelevanceGraph(macid)
+        rg = relevance_graph if relevance_graph is not None else RelevanceGraph(macid)
         con_rel = nx.condensation(rg)
         self.add_nodes_from(con_rel.nodes)
         self.add_edges_from(con_rel.edges)
@@ -109,6 +109,17 @@ class CondensedRelevanceGraph(nx.DiGraph):
         decs_in_each_scc = [self.get_decisions_in_scc()[scc] for scc in list(nx.topological_sort(self))]
         return decs_in_each_scc
 
+    def get_scc_levels(self) -> List[List[List[str]]]:
+        """
+        Return the SCCs grouped into levels, each SCC given as a list of decision nodes.
+
+        The SCCs in a level only rely on SCCs in earlier levels, so they can be solved independently of each other
+        once the earlier levels have been solved.
+        """
+        decisions_in_scc = self.get_decisions_in_scc()
+        levels = nx.topological_generations(nx.DiGraph(self).reverse(copy=False))
+        return [[decisions_in_scc[scc] for scc in level] for level in levels]
+
     def get_decisions_in_scc(self) -> Dict[int, List[str]]:
         """Return a dictionary matching each SCC with a list of decision nodes that it contains"""
         scc_dec_mapping: Dict[int, List[str]] = {}
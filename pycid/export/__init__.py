@@ -1 +1,8 @@
-from pycid.export.gambit import behavior_to_cpd, macid_to_efg, macid_to_gambit_file, pygambit_ne_solver  # noqa
+from pycid.export.gambit import (  # noqa
+    EFGTree,
+    behavior_to_cpd,
+    macid_to_efg,
+    macid_to_efg_tree,
+    macid_to_gambit_file,
+    pygambit_ne_solver,
+)
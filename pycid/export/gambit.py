@@ -3,7 +3,21 @@ from __future__ import annotations
 import itertools
 from collections import defaultdict
 from functools import partial, update_wrapper
-from typing import Any, Callable, Dict, Hashable, Iterable, KeysView, List, Mapping, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    KeysView,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from warnings import warn
 
 import pygambit
@@ -14,6 +28,37 @@ from pycid.core.macid_base import MACIDBase
 Outcome = Any
 
 
+class EFGTree(NamedTuple):
+    """A pygambit EFG built from a MACID, with the parts of it that depend on the MACID's CPDs.
+
+    - game: The pygambit game object.
+    - parents_to_infoset: A mapping from (agent, (parent, instantiation), ...) to pygambit infoset.
+    - chance_moves: Each chance move with its chance node and the instantiation of the node's parents.
+    - leaves: Each leaf outcome with the instantiation of the EFG nodes on the path to it.
+    - agents: The agents, in the order of the payoffs in each outcome.
+    """
+
+    game: pygambit.Game
+    parents_to_infoset: Mapping[Tuple[Hashable, Tuple[Tuple[Any, Any], ...]], pygambit.Infoset]
+    chance_moves: List[Tuple[pygambit.Infoset, str, Dict[str, Any]]]
+    leaves: List[Tuple[Outcome, Dict[str, Any]]]
+    agents: List[Hashable]
+
+
+# pygambit solver for each solver name, and whether its NEs are mixed strategy profiles
+# that must be converted to behavior strategies (lcp and lp solve the sequence form directly)
+_SOLVERS: Dict[str, Tuple[Callable[[pygambit.Game], List], bool]] = {
+    "enumpure": (pygambit.nash.enumpure_solve, True),
+    "enummixed": (partial(pygambit.nash.enummixed_solve, rational=False), True),
+    "lcp": (partial(pygambit.nash.lcp_solve, rational=False), False),
+    "lp": (partial(pygambit.nash.lp_solve, rational=False), False),
+    "simpdiv": (pygambit.nash.simpdiv_solve, True),
+    "ipa": (pygambit.nash.ipa_solve, True),
+    "gnm": (pygambit.nash.gnm_solve, True),
+}
+_TWO_PLAYER_ONLY = frozenset({"enummixed", "lcp", "lp"})
+
+
 def macid_to_efg(
     macid: MACIDBase,
     decisions_in_sg: Optional[Union[KeysView[str], Set[str]]] = None,
@@ -35,12 +80,44 @@ def macid_to_efg(
     - parents_to_infoset: A mapping from (agent, (parent, instantiation), ...) to pygambit infoset.
     """
 
-    # can use on a subgame if copying, else do the whole game
-    if decisions_in_sg is None:
-        decisions_in_sg = macid.decisions
-    if agents_in_sg is None:
-        agents_in_sg = macid.agents
+    efg_tree = macid_to_efg_tree(macid, decisions_in_sg, agents_in_sg)
+    return efg_tree.game, efg_tree.parents_to_infoset
+
 
+def macid_to_efg_tree(
+    macid: MACIDBase,
+    decisions_in_sg: Optional[Union[KeysView[str], Set[str]]] = None,
+    agents_in_sg: Optional[Iterable[Hashable]] = None,
+    efg_tree: Optional[EFGTree] = None,
+) -> EFGTree:
+    """
+    Creates a pygambit EFG from a MACID as in macid_to_efg, or refills an existing one.
+    Args:
+    - macid: The MACID object to convert to a pygambit EFG.
+    - decisions_in_sg: The decisions to include in the EFG. If None, all decisions are included.
+    - agents_in_sg: The agents to include in the EFG. If None, all agents are included.
+    - efg_tree: An EFG tree built from a MACID with the same graph, domains, decisions and agents.
+      If given, only its chance probabilities and payoffs are set, from the CPDs of this MACID.
+    Returns:
+    - The EFG tree, whose game and parents_to_infoset are as returned by macid_to_efg.
+    """
+    if efg_tree is None:
+        # can use on a subgame if copying, else do the whole game
+        if decisions_in_sg is None:
+            decisions_in_sg = macid.decisions
+        if agents_in_sg is None:
+            agents_in_sg = macid.agents
+        efg_tree = _build_efg_tree(macid, decisions_in_sg, agents_in_sg)
+    _set_efg_parameters(macid, efg_tree)
+    return efg_tree
+
+
+def _build_efg_tree(
+    macid: MACIDBase,
+    decisions_in_sg: Union[KeysView[str], Set[str]],
+    agents_in_sg: Iterable[Hashable],
+) -> EFGTree:
+    """Build the tree of the EFG of a MACID, leaving chance probabilities and payoffs unset."""
     # choose only relevant nodes
     game_tree_nodes = set(
         list(decisions_in_sg) + [parent for dec in decisions_in_sg for parent in macid.get_parents(dec)]
@@ -54,6 +131,8 @@ def macid_to_efg(
 
     # key is instantiation of parents, value is pygambit infoset
     parents_to_infoset: Dict[Tuple[Hashable, Tuple[Tuple[Any, Any], ...]], pygambit.Infoset] = defaultdict(dict)
+    # chance moves with the chance node and instantiation of its parents they were added for
+    chance_moves = []
     # nodes referenced in the game tree. Root has node_idx (0,), rest are (0, n, m, ...)
     # state is a dict of node_idx:state of partial instantiations of nodes
     node_idx_to_state: Dict[Tuple[int, ...], Dict[str, Any]] = defaultdict(dict)
@@ -95,21 +174,41 @@ def macid_to_efg(
                     state_info.update({node: action})
                     node_idx_to_state[node_idx + (action_idx,)] = state_info
             else:
-                # otherwise is a chance node
-                factor = macid.query([node], context=parents_actions)
-                move = cur_node.append_move(game.players.chance, factor.cardinality)
-                # add state info
+                # otherwise is a chance node, whose probabilities are set by _set_efg_parameters
                 actions = macid.model.domain[node]
-                for action_idx, prob in enumerate(factor.values):
-                    move.actions[action_idx].label = str(actions[action_idx])
-                    move.actions[action_idx].prob = pygambit.Decimal(prob)
+                move = cur_node.append_move(game.players.chance, len(actions))
+                chance_moves.append((move, node, parents_actions))
+                # add state info
+                for action_idx, action in enumerate(actions):
+                    move.actions[action_idx].label = str(action)
                     state_info = node_idx_to_state[node_idx].copy()
-                    state_info.update({node: actions[action_idx]})
+                    state_info.update({node: action})
                     node_idx_to_state[node_idx + (action_idx,)] = state_info
 
-    game = _add_payoffs(macid, game, range_num_children, node_idx_to_state, agents_in_sg)
+    # add the leaves, whose payoffs are set by _set_efg_parameters
+    leaves = []
+    for node_idx in itertools.product(*range_num_children):
+        # name outcome as a string of the node_idx
+        outcome = game.outcomes.add(str(node_idx))
+        _get_cur_node(game, node_idx).outcome = outcome
+        leaves.append((outcome, node_idx_to_state[node_idx]))
+
+    return EFGTree(game, parents_to_infoset, chance_moves, leaves, list(agents_in_sg))
+
 
-    return game, parents_to_infoset
+def _set_efg_parameters(macid: MACIDBase, efg_tree: EFGTree) -> None:
+    """Set the chance probabilities and payoffs of an EFG tree from the CPDs of a MACID.
+
+    The MACID must have the same graph and domains as the one the tree was built from,
+    so that a tree can be reused for MACIDs differing only in their CPDs.
+    """
+    for move, node, parents_actions in efg_tree.chance_moves:
+        factor = macid.query([node], context=parents_actions)
+        for action_idx, prob in enumerate(factor.values):
+            move.actions[action_idx].prob = pygambit.Decimal(prob)
+    for outcome, context in efg_tree.leaves:
+        for i, agent in enumerate(efg_tree.agents):
+            outcome[i] = pygambit.Decimal(macid.expected_utility(context=context, agent=agent))
 
 
 def macid_to_gambit_file(macid: MACIDBase, filename: str = "macid.efg") -> bool:
@@ -138,37 +237,30 @@ def pygambit_ne_solver(
     Returns a list of behaviour strategies corresponding to NEs.
     """
     # check if a 2 player game, if so, default to enummixed, else enumpure
-    two_player = True if len(game.players) == 2 else False
+    two_player = len(game.players) == 2
     if solver_override is None:
         solver = "enummixed" if two_player else "enumpure"
-    elif solver_override in ["enummixed", "lcp", "lp"] and not two_player:
+    elif solver_override in _TWO_PLAYER_ONLY and not two_player:
         warn(f"Solver {solver_override} not allowed for non-2 player games. Using 'enumpure' instead.")
         solver = "enumpure"
     else:
         solver = solver_override
 
-    if solver == "enummixed":
-        mixed_strategies = pygambit.nash.enummixed_solve(game, rational=False)
-    elif solver == "enumpure":
-        mixed_strategies = pygambit.nash.enumpure_solve(game)
-        # if no pure NEs found, try simpdiv if not overridden by user
-        if len(mixed_strategies) == 0 and solver_override is None:
-            warn("No pure NEs found using enumpure. Trying simpdiv.")
-            mixed_strategies = pygambit.nash.simpdiv_solve(game)
-    elif solver == "lcp":
-        mixed_strategies = pygambit.nash.lcp_solve(game, rational=False)
-    elif solver == "lp":
-        mixed_strategies = pygambit.nash.lp_solve(game, rational=False)
-    elif solver == "simpdiv":
+    try:
+        solve, convert_to_behavior = _SOLVERS[solver]
+    except KeyError:
+        raise ValueError(f"Solver {solver} not recognised") from None
+
+    mixed_strategies = solve(game)
+    # if no pure NEs found, try simpdiv if not overridden by user
+    if solver == "enumpure" and len(mixed_strategies) == 0 and solver_override is None:
+        warn("No pure NEs found using enumpure. Trying simpdiv.")
         mixed_strategies = pygambit.nash.simpdiv_solve(game)
-    elif solver == "ipa":
-        mixed_strategies = pygambit.nash.ipa_solve(game)
-    elif solver == "gnm":
-        mixed_strategies = pygambit.nash.gnm_solve(game)
-    else:
-        raise ValueError(f"Solver {solver} not recognised")
     # convert to behavior strategies
-    behavior_strategies = [x.as_behavior() if solver not in ["lp", "lcp"] else x for x in mixed_strategies]
+    if convert_to_behavior:
+        behavior_strategies = [x.as_behavior() for x in mixed_strategies]
+    else:
+        behavior_strategies = list(mixed_strategies)
 
     return behavior_strategies
 
@@ -234,27 +326,6 @@ def _add_players(game: pygambit.Game, agents_in_sg: Iterable[Hashable]) -> Dict[
     return agent_to_player
 
 
-def _add_payoffs(
-    macid: MACIDBase,
-    game: pygambit.Game,
-    range_num_children: List[List],
-    node_idx_to_state: Dict[Tuple[int, ...], Dict[str, Any]],
-    agents_in_sg: Iterable[Hashable],
-) -> pygambit.Game:
-    """add payoffs to the game as leave nodes"""
-    for node_idx in itertools.product(*range_num_children):
-        cur_node = _get_cur_node(game, node_idx)
-        context = node_idx_to_state[node_idx]
-        # name outcome as a string of the node_idx
-        payoff_tuple = game.outcomes.add(str(node_idx))
-        for i, agent in enumerate(agents_in_sg):
-            payoff = macid.expected_utility(context=context, agent=agent)
-            payoff_tuple[i] = pygambit.Decimal(payoff)
-        cur_node.outcome = payoff_tuple
-
-    return game
-
-
 def _get_cur_node(game: pygambit.Game, idx: Tuple[int, ...]) -> pygambit.Node:
     """Returns the current node in the game tree given the index of the node."""
     cur_node = game.root
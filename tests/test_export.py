@@ -4,7 +4,13 @@ import unittest
 import pytest
 
 from pycid.examples.story_macids import matching_pennies, taxi_competition
-from pycid.export.gambit import behavior_to_cpd, macid_to_efg, macid_to_gambit_file, pygambit_ne_solver
+from pycid.export.gambit import (
+    behavior_to_cpd,
+    macid_to_efg,
+    macid_to_efg_tree,
+    macid_to_gambit_file,
+    pygambit_ne_solver,
+)
 
 
 class TestExport(unittest.TestCase):
@@ -19,6 +25,21 @@ class TestExport(unittest.TestCase):
         self.assertEqual(len(game.outcomes), 4)
         self.assertEqual(len(game.infosets), 3)
 
+    # @unittest.skip("")
+    def test_efg_tree_reuse(self) -> None:
+        macid = taxi_competition()
+        efg_tree = macid_to_efg_tree(macid)
+        # the tree is refilled with the payoffs of a MACID with the same graph but different CPDs
+        macid.add_cpds(U1=lambda D1, D2: 10 if D1 == D2 else 0)
+        self.assertIs(macid_to_efg_tree(macid, efg_tree=efg_tree).game, efg_tree.game)
+        expected, _ = macid_to_efg(macid)
+        game = efg_tree.game
+        self.assertEqual(
+            [[float(outcome[i]) for i in range(2)] for outcome in game.outcomes],
+            [[float(outcome[i]) for i in range(2)] for outcome in expected.outcomes],
+        )
+        self.assertIn(10.0, [float(outcome[0]) for outcome in game.outcomes])
+
     # @unittest.skip("")
     def test_macid_to_gambit_file(self) -> None:
         macid = taxi_competition()
@@ -42,6 +63,8 @@ class TestExport(unittest.TestCase):
         self.assertEqual(len(pygambit_ne_solver(game)), 4)
         self.assertEqual(len(pygambit_ne_solver(game, solver_override="enumpure")), 3)
         self.assertEqual(len(pygambit_ne_solver(game, solver_override="gnm")), 1)
+        with self.assertRaises(ValueError):
+            pygambit_ne_solver(game, solver_override="unknown")
         macid2 = matching_pennies()
         game2, _ = macid_to_efg(macid2)
         self.assertEqual(len(pygambit_ne_solver(game2)), 1)
@@ -1,9 +1,11 @@
 import sys
 import unittest
 
+import networkx as nx
 import numpy as np
 import pytest
 
+from pycid.core.macid import MACID, _descendant_closed_subsets
 from pycid.core.relevance_graph import CondensedRelevanceGraph
 from pycid.examples.simple_macids import (
     basic_different_dec_cardinality,
@@ -31,6 +33,26 @@ class TestMACID(unittest.TestCase):
         macid = get_basic_subgames3()
         self.assertTrue(len(macid.decs_in_each_maid_subgame()) == 5)
 
+    # @unittest.skip("")
+    def test_descendant_closed_subsets(self) -> None:
+        n = sys.getrecursionlimit() + 10
+        chain = nx.path_graph(n, create_using=nx.DiGraph)
+        self.assertEqual(len(list(_descendant_closed_subsets(chain))), n)
+        diamond = nx.DiGraph([(0, 1), (0, 2), (1, 3), (2, 3)])
+        self.assertCountEqual(_descendant_closed_subsets(diamond), [{3}, {1, 3}, {2, 3}, {1, 2, 3}, {0, 1, 2, 3}])
+
+    # @unittest.skip("")
+    def test_condensed_relevance_graph_cache(self) -> None:
+        macid = get_basic_subgames()
+        con_rel = macid._condensed_relevance_graph
+        self.assertIs(macid._condensed_relevance_graph, con_rel)
+        self.assertEqual(len(con_rel.nodes), 3)
+        macid.make_chance("D11")
+        self.assertEqual(len(macid._condensed_relevance_graph.nodes), 2)
+        con_rel = macid._condensed_relevance_graph
+        macid.add_edge("D12", "D3")
+        self.assertIsNot(macid._condensed_relevance_graph, con_rel)
+
     # @unittest.skip("")
     def test_policy_profile_assignment(self) -> None:
         macid = taxi_competition()
@@ -113,6 +135,31 @@ class TestMACID(unittest.TestCase):
         macid4 = two_agents_three_actions()
         self.assertEqual(len(macid4.get_ne()), 1)
 
+    # @unittest.skip("")
+    def test_get_ne_independent_parts(self) -> None:
+        macid = MACID(
+            [("D1", "U1"), ("D2", "U2"), ("D3", "U3")],
+            agent_decisions={1: ["D1"], 2: ["D2"], 3: ["D3"]},
+            agent_utilities={1: ["U1"], 2: ["U2"], 3: ["U3"]},
+        )
+        macid.add_cpds(D1=[0, 1], D2=[0, 1], D3=[0, 1], U1=lambda D1: D1, U2=lambda D2: 0, U3=lambda D3: -D3)
+        all_ne = macid.get_ne()
+        self.assertEqual(len(all_ne), 2)
+        for ne in all_ne:
+            joint_policy = macid.policy_profile_assignment(ne)
+            self.assertTrue(np.array_equal(joint_policy["D1"].values, np.array([0, 1])))
+            self.assertTrue(np.array_equal(joint_policy["D3"].values, np.array([1, 0])))
+
+        # D2 observes D1, so a pure D1 leaves one of D2's information sets unreached and D2 may do anything there
+        macid = MACID(
+            [("D1", "D2"), ("D1", "U1"), ("D2", "U2"), ("D1", "U2")],
+            agent_decisions={1: ["D1"], 2: ["D2"]},
+            agent_utilities={1: ["U1"], 2: ["U2"]},
+        )
+        macid.add_cpds(D1=[0, 1], D2=[0, 1], U1=lambda D1: D1, U2=lambda D1, D2: int(D1 == D2))
+        self.assertEqual(len(macid.get_ne("enumpure")), 2)
+        self.assertEqual(len(macid.get_ne_in_sg(["D1", "D2"], "enumpure")), 2)
+
     # @unittest.skip("")
     def test_create_subgame(self) -> None:
         macid = subgame_mixed_spe()
@@ -143,6 +190,17 @@ class TestMACID(unittest.TestCase):
         mixed_ne_in_subgame = macid.get_ne_in_sg(decisions_in_sg=["D2"], solver="enummixed")
         self.assertEqual(len(mixed_ne_in_subgame), 1)
 
+    # @unittest.skip("")
+    def test_get_spe_iter(self) -> None:
+        macid = modified_taxi_competition()
+        spe_iter = macid.get_spe_iter("enumpure")
+        first_spe = next(spe_iter)
+        self.assertEqual(len(list(spe_iter)), 1)
+        expected = macid.get_spe("enumpure")[0]
+        for cpd, expected_cpd in zip(first_spe, expected):
+            self.assertEqual(cpd.variable, expected_cpd.variable)
+            self.assertTrue(np.array_equal(cpd.values, expected_cpd.values))
+
     # @unittest.skip("")
     def test_get_spe(self) -> None:
         macid = taxi_competition()
@@ -155,6 +213,23 @@ class TestMACID(unittest.TestCase):
         self.assertTrue(np.array_equal(cpd_d1.values, np.array([1, 0])))
         self.assertTrue(np.array_equal(cpd_d2.values, np.array([[0, 1], [1, 0]])))
 
+        # D2 is an SCC on its own, so its imputed rule is kept rather than re-optimised
+        macid = taxi_competition()
+        macid.impute_random_decision("D2")
+        all_spe = macid.get_spe()
+        self.assertTrue(len(all_spe) == 1)
+        joint_policy = macid.policy_profile_assignment(all_spe[0])
+        self.assertTrue(np.array_equal(joint_policy["D1"].values, np.array([1, 0])))
+        self.assertTrue(np.array_equal(joint_policy["D2"].values, np.array([[0.5, 0.5], [0.5, 0.5]])))
+
+        # D1 and D2 form one SCC and D2 has no rule yet, so D1's imputed rule is re-optimised as well
+        macid = prisoners_dilemma()
+        macid.impute_random_decision("D1")
+        all_spe = macid.get_spe("enumpure")
+        self.assertTrue(len(all_spe) == 1)
+        joint_policy = macid.policy_profile_assignment(all_spe[0])
+        self.assertTrue(np.array_equal(joint_policy["D1"].values, np.array([0, 1])))
+
         macid = subgame_mixed_spe()
         joint_policy = macid.policy_profile_assignment(macid.get_spe()[0])
         cpd_d1 = joint_policy["D1"]
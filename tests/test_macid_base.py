@@ -7,6 +7,7 @@ from pycid.core.cpd import DecisionDomain
 from pycid.core.macid_base import MechanismGraph
 from pycid.core.relevance_graph import CondensedRelevanceGraph, RelevanceGraph
 from pycid.examples.simple_cids import get_3node_cid, get_5node_cid, get_minimal_cid
+from pycid.examples.simple_macids import get_basic_subgames3
 from pycid.examples.story_macids import forgetful_movie_star, prisoners_dilemma, subgame_difference, taxi_competition
 
 
@@ -150,6 +151,12 @@ class TestBASE(unittest.TestCase):
         example = taxi_competition()
         self.assertTrue(example.is_s_reachable("D1", "D2"))
         self.assertFalse(example.is_s_reachable("D2", "D1"))
+        # the cached mechanism graph is rebuilt after a structural change
+        mech_graph = example._mechanism_graph
+        self.assertIs(example._mechanism_graph, mech_graph)
+        example.remove_edge("D2", "U1")
+        self.assertIsNot(example._mechanism_graph, mech_graph)
+        self.assertFalse(example.is_s_reachable("D1", "D2"))
 
         example2 = subgame_difference()
         self.assertTrue(example2.is_s_reachable("D1", "D2"))
@@ -162,6 +169,13 @@ class TestBASE(unittest.TestCase):
         self.assertFalse(example.is_r_reachable("D2", "N"))
         self.assertFalse(example.is_r_reachable("D1", "N"))
         self.assertTrue(example.is_r_reachable("D1", "D2"))
+        self.assertTrue(example.is_r_reachable(["D1", "D2"], ["N", "D2"]))
+        # the r-reachable nodes of each decision are memoised until the structure changes
+        self.assertIn("D1", example._r_reachable_nodes)
+        example.remove_edge("D1", "D2")
+        self.assertNotIn("D1", example._r_reachable_nodes)
+        with self.assertRaises(KeyError):
+            example.is_r_reachable("D1", "X")
 
     # @unittest.skip("")
     def test_relevance_graph(self) -> None:
@@ -180,12 +194,31 @@ class TestBASE(unittest.TestCase):
         crg = CondensedRelevanceGraph(example)
         self.assertEqual(crg.get_scc_topological_ordering(), [["D1"], ["D2"]])
         self.assertEqual(crg.get_decisions_in_scc()[0], ["D2"])
+        self.assertEqual(crg.get_scc_levels(), [[["D2"]], [["D1"]]])
+        crg3 = CondensedRelevanceGraph(get_basic_subgames3())
+        self.assertEqual(crg3.get_scc_levels(), [[["D1"]], [["D2"], ["D3"]], [["D4"]]])
 
     # @unittest.skip("")
     def test_copy_without_cpds(self) -> None:
         cid = get_3node_cid()
         cid_no_cpds = cid.copy_without_cpds()
         self.assertTrue(len(cid_no_cpds.cpds) == 0)
+        macid = taxi_competition()
+        macid_no_cpds = macid.copy_without_cpds()
+        self.assertEqual(macid_no_cpds.agent_decisions, macid.agent_decisions)
+        self.assertEqual(macid_no_cpds.utility_agent, macid.utility_agent)
+        self.assertEqual(list(macid_no_cpds.nodes), list(macid.nodes))
+        macid_no_cpds.make_chance("D2")
+        self.assertCountEqual(macid.decisions, ["D1", "D2"])
+
+    def test_cpd_overlay(self) -> None:
+        macid = prisoners_dilemma()
+        with macid._cpd_overlay(["D1"]):
+            macid.impute_random_decision("D1")
+            self.assertFalse(isinstance(macid.get_cpds("D1"), DecisionDomain))
+        self.assertTrue(isinstance(macid.get_cpds("D1"), DecisionDomain))
+        macid.create_subgame(["D2"])
+        self.assertTrue(isinstance(macid.get_cpds("D1"), DecisionDomain))
 
     def test_remove_all_decision_rules(self) -> None:
         macid = prisoners_dilemma()